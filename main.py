@@ -5,11 +5,18 @@
 Implements the Best Buy - Store CLI.
 """
 
-from typing import List, Tuple
+import sys
+from typing import Callable, Dict, Sequence
 
 from products import Product, NonStockedProduct, LimitedProduct
 from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
-from store import Store, ProductOrder
+from store import Store, ProductOrder, ActiveProducts
+
+try:
+    # line-editing input() for the prompts, not available on Windows
+    import readline  # noqa: F401
+except ImportError:
+    pass
 
 STORE_MENU = """
    Store Menu
@@ -20,77 +27,133 @@ STORE_MENU = """
 4. Quit
 Please choose a number: """
 
+PRODUCT_PROMPT = "Which product # do you want? "
+AMOUNT_PROMPT = "What amount do you want? "
+ORDER_ERROR = "\n- Error adding product ! -\n"
+
 
-def show_all_products(products: List[Product]):
+def show_all_products(products: Sequence[Product]):
     """
     Prints out all products in a list of products.
+    The listing is written to stdout at once.
+    """
+    lines = ["", "-----"]
+    lines.extend(
+        f"{lino}. {product.show()}"
+        for lino, product in enumerate(products, 1)
+    )
+    lines.append("-----\n    ")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _list_products(
+    store: Store, products: ActiveProducts
+) -> ActiveProducts:
+    """
+    Menu option 1: lists all active products in store.
+    """
+    show_all_products(products)
+    return products
+
+
+def _show_total(store: Store, products: ActiveProducts) -> ActiveProducts:
+    """
+    Menu option 2: shows the total amount of items in store.
+    """
+    print(f"\nTotal of {store.get_total_quantity()} items in store\n")
+    return products
+
+
+def _make_order(store: Store, products: ActiveProducts) -> ActiveProducts:
     """
-    lino = 0
-    print("\n-----")
-    for product in products:
-        lino += 1
-        print(f"{lino}. {product}")
-    print("""-----
-    """)
+    Menu option 3: takes a shopping list from the user and orders it.
+    Returns the refreshed tuple of active products.
+    """
+    products_len: int = len(products)
+    prod_num: str | int
+    prod_qty: str | int
+    # orders keyed by product-index, repeated products are summed up
+    orders: Dict[int, ProductOrder] = {}
+    get_order = orders.get
+    get_product = products.__getitem__
+    show_all_products(products)
+    print("When you want to finish order, enter empty text.")
+    while True:
+        prod_num = input(PRODUCT_PROMPT)
+        if not prod_num:
+            break
+        prod_qty = input(AMOUNT_PROMPT)
+        if not prod_qty:
+            break
+        try:
+            prod_index = int(prod_num) - 1
+        except ValueError:
+            print(ORDER_ERROR)
+            continue
+        if not 0 <= prod_index < products_len:
+            print("\n- Product-Index # out of bounds ! - \n")
+            continue
+        try:
+            prod_qty = int(prod_qty)
+        except ValueError:
+            print(ORDER_ERROR)
+            continue
+        if prod_qty <= 0:
+            print(ORDER_ERROR)
+            continue
+        order = get_order(prod_index)
+        if order is None:
+            orders[prod_index] = (get_product(prod_index), prod_qty)
+        else:
+            orders[prod_index] = (order[0], order[1] + prod_qty)
+        print("\nProduct added to list!\n")
+    if orders:
+        try:
+            total_price = store.order(list(orders.values()))
+            products = store.get_all_products()
+            print(
+                f"********\n"
+                f"Order made! Total payment ${total_price:.2f}"
+            )
+        except ValueError as e:
+            print(f"Error:\n\t{e.message}")
+    return products
+
+
+def _quit(store: Store, products: ActiveProducts) -> None:
+    """
+    Menu option 4: quits the CLI.
+    """
+    return None
+
+
+# Maps each menu choice to its handler. A handler returns the (refreshed)
+# tuple of active products, or None to quit.
+Handler = Callable[[Store, ActiveProducts], ActiveProducts | None]
+HANDLERS: Dict[int, Handler] = {
+    1: _list_products,
+    2: _show_total,
+    3: _make_order,
+    4: _quit,
+}
 
 
 def start(store: Store):
     """
     CLI implementation for the "Best Buy" store.
     """
-    do_quit = False
-    while not do_quit:
-        products: List[Product] = store.get_all_products()
-        products_len: int = len(products)
+    products: ActiveProducts | None = store.get_all_products()
+    while products is not None:
         try:
             choice = int(input(STORE_MENU))
         except ValueError:
             print("Error with your choice! Try again!")
-        match choice:
-            case 1:
-                show_all_products(products)
-            case 2:
-                print(
-                    f"\nTotal of {store.get_total_quantity()} items in store\n"
-                )
-            case 3:
-                prod_num: str | int
-                prod_qty: str | int
-                order: ProductOrder
-                shopping_list: List[Tuple[Product, int]] = []
-                show_all_products(products)
-                print("When you want to finish order, enter empty text.")
-                while True:
-                    prod_num = input("Which product # do you want? ")
-                    prod_qty = input("What amount do you want? ")
-                    if len(prod_num) == 0 or len(prod_qty) == 0:
-                        break
-                    try:
-                        prod_index = int(prod_num) - 1
-                        if prod_index >= products_len or prod_index < 0:
-                            raise IndexError
-                        prod_qty = int(prod_qty)
-                        if prod_qty <= 0:
-                            raise ValueError
-                        order = (products[prod_index], prod_qty)
-                        shopping_list.append(order)
-                        print("\nProduct added to list!\n")
-                    except IndexError:
-                        print("\n- Product-Index # out of bounds ! - \n")
-                    except ValueError:
-                        print("\n- Error adding product ! -\n")
-                if len(shopping_list) > 0:
-                    try:
-                        total_price = store.order(shopping_list)
-                        print(
-                            f"********\n"
-                            f"Order made! Total payment ${total_price:.2f}"
-                        )
-                    except ValueError as e:
-                        print(f"Error:\n\t{e.message}")
-            case 4:
-                do_quit = True
-        continue
+            continue
+        handler = HANDLERS.get(choice)
+        if handler is None:
+            print("Error with your choice! Try again!")
+            continue
+        products = handler(store, products)
 
 
 def main():
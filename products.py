@@ -7,9 +7,10 @@ Implementation of Product class interface, plus OutOfStockError
 and NonStockedProduct + LimitedProduct subclasses
 """
 
-from abc import ABC, abstractmethod
+import sys
+import weakref
 
-from promotions import Promotion
+from promotions import Promotion, PROMO_TABLE, PROMO_NONE, PROMO_CUSTOM
 
 
 class MaximumValueError(Exception):
@@ -32,21 +33,52 @@ class OutOfStockValueError(Exception):
         super().__init__(self.message)
 
 
-class BaseProduct(ABC):
-    @abstractmethod
-    def __str__(self) -> str:
+class _StoreRef(weakref.ref):
+    """
+    Weak reference from a product to a Store holding it.
+    Removes itself from the product once the store is released.
+    """
+
+    __slots__ = ("_product_ref",)
+
+    def __new__(cls, store, product):
+        return super().__new__(cls, store, _prune_store_ref)
+
+    def __init__(self, store, product):
+        super().__init__(store, _prune_store_ref)
+        self._product_ref = weakref.ref(product)
+
+
+def _prune_store_ref(store_ref: _StoreRef):
+    """
+    Callback of a released store, drops its reference from the product.
+    """
+    product = store_ref._product_ref()
+    if product is not None:
+        product._stores = tuple(
+            ref for ref in product._stores if ref is not store_ref
+        )
+
+
+class BaseProduct:
+    """
+    Interface every product provides. Subclasses override all methods.
+    """
+
+    __slots__ = ()
+
+    def show(self) -> str:
         """
         Returns a string that represents the product.
         """
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def buy(self, quantity: int) -> float:
         """
         Checks the quantity, if inside available boundaries.
         Returns the total price (float) of the purchase.
         """
-        pass
+        raise NotImplementedError
 
 
 class Product(BaseProduct):
@@ -59,31 +91,84 @@ class Product(BaseProduct):
     When someone will purchase it, the amount will be modified accordingly.
     """
 
+    __slots__ = (
+        "_name",
+        "_hash",
+        "_price",
+        "_price_str",
+        "_quantity",
+        "_active",
+        "_promotion",
+        "_price_fn",
+        "_promo_param",
+        "_show_cache",
+        "_stores",
+        "__weakref__",
+    )
+
     def __init__(self, name: str, price: float | int, quantity: int):
         """
         Initializes a Product.
         """
-        self.activate()
+        self._show_cache = None
+        # weak references to the stores, so discarded stores are released
+        self._stores = ()
         if len(name) == 0:
             raise ValueError("argument 'name' is an empty string.")
-        self._name = name
-        if float(price) < 0.00:
+        self._name = sys.intern(name)
+        self._hash = hash(self._name)
+        if type(price) is not float:
+            price = float(price)
+        if price < 0.00:
             raise ValueError("argument 'price' is negative.")
-        self._price = float(price)
-        if int(quantity) < 0:
+        self._price = price
+        self._price_str = f"${price:.2f}"
+        if type(quantity) is not int:
+            quantity = int(quantity)
+        if quantity < 0:
             raise ValueError("argument 'quantity' is negative.")
-        self.quantity = int(quantity)
+        self._quantity = quantity
+        self._active = quantity >= 1
         self.promotion = None
 
     def __str__(self) -> str:
         """
         Returns a string that represents the product.
         """
-        return (
-            f"'{self.name}', Price: ${self.price:.2f}, "
-            f"Quantity: {self.quantity}, "
-            f"Promotion: {self.promotion}"
+        return self.show()
+
+    def show(self) -> str:
+        """
+        Returns a string that represents the product.
+        The string is cached until quantity, promotion or state change.
+        """
+        return self._show_cache or self._build_show()
+
+    def _build_show(self) -> str:
+        """
+        Builds and caches the string that represents the product.
+        """
+        self._show_cache = (
+            f"'{self._name}', Price: {self._price_str}, "
+            f"Quantity: {self._quantity}, "
+            f"Promotion: {self._promotion}"
         )
+        return self._show_cache
+
+    def __eq__(self, other_prod) -> bool:
+        """
+        Checks if both products have the same name.
+        Names are interned, so an identity-check is sufficient.
+        """
+        if isinstance(other_prod, Product):
+            return self._name is other_prod._name
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """
+        Returns the (precomputed) hash of the product-name.
+        """
+        return self._hash
 
     def __gt__(self, other_prod) -> bool:
         """
@@ -114,11 +199,11 @@ class Product(BaseProduct):
         return self._price
 
     @property
-    def quantity(self) -> float:
+    def quantity(self) -> int:
         """
         Getter for product-quantity.
         """
-        return float(self._quantity)
+        return self._quantity
 
     @quantity.setter
     def quantity(self, quantity: int):
@@ -129,7 +214,12 @@ class Product(BaseProduct):
             raise ValueError("argument 'quantity' is negative.")
         if quantity < 1:
             self.deactivate()
+        for store_ref in self._stores:
+            store = store_ref()
+            if store is not None:
+                store._total_quantity += quantity - self._quantity
         self._quantity = quantity
+        self._show_cache = None
 
     @property
     def promotion(self) -> Promotion | None:
@@ -146,11 +236,31 @@ class Product(BaseProduct):
         Sets the active Promotion instance.
         """
         self._promotion = promotion
+        # resolve the pricing function once, instead of on every buy()
+        if promotion is None:
+            self._price_fn = PROMO_TABLE[PROMO_NONE]
+            self._promo_param = 0.0
+        elif promotion.kind == PROMO_CUSTOM:
+            self._price_fn = self._apply_promotion
+            self._promo_param = 0.0
+        else:
+            self._price_fn = PROMO_TABLE[promotion.kind]
+            self._promo_param = promotion.param
+        self._show_cache = None
 
     @promotion.deleter
     def promotion(self):
         self.promotion = None
 
+    def _apply_promotion(
+        self, price: float, quantity: int, param: float
+    ) -> float:
+        """
+        Pricing function for promotions outside of PROMO_TABLE.
+        Returns the price computed by the Promotion instance.
+        """
+        return self._promotion.apply_promotion(self, quantity)
+
     def set_promotion(self, promotion: Promotion):
         """
         Method for activivating a Promotion.
@@ -171,12 +281,38 @@ class Product(BaseProduct):
         Activates the product.
         """
         self._active = True
+        self._show_cache = None
+        for store_ref in self._stores:
+            store = store_ref()
+            if store is not None:
+                store._active_cache = None
 
     def deactivate(self):
         """
         Deactivates the product.
         """
         self._active = False
+        self._show_cache = None
+        for store_ref in self._stores:
+            store = store_ref()
+            if store is not None:
+                store._active_cache = None
+
+    def _attach(self, store):
+        """
+        Registers a Store holding this product, so its total quantity
+        and list of active products follow changes of the product.
+        The store is referenced weakly, and dropped once it is released.
+        """
+        self._stores += (_StoreRef(store, self),)
+
+    def _detach(self, store):
+        """
+        Unregisters a Store that no longer holds this product.
+        """
+        self._stores = tuple(
+            ref for ref in self._stores if ref() is not store
+        )
 
     def buy(self, quantity: int) -> float:
         """
@@ -184,18 +320,23 @@ class Product(BaseProduct):
         Updates the quantity of the product.
         Returns the total price (float) of the purchase.
         """
-        if int(quantity) <= 0:
+        if quantity <= 0:
             raise ValueError(
                 "argument 'quantity' must be >= 1 to buy a product"
             )
-        if (self.quantity - int(quantity)) < 0:
+        stock = self._quantity - quantity
+        if stock < 0:
             raise OutOfStockValueError(self._name, quantity)
-        self.quantity -= int(quantity)
+        self._quantity = stock
+        for store_ref in self._stores:
+            store = store_ref()
+            if store is not None:
+                store._total_quantity -= quantity
+        if stock < 1:
+            self.deactivate()
+        self._show_cache = None
 
-        if self.promotion is not None:
-            return self.promotion.apply_promotion(self, quantity)
-        else:
-            return float(quantity) * self.price
+        return self._price_fn(self._price, quantity, self._promo_param)
 
 
 class NonStockedProduct(Product):
@@ -205,19 +346,22 @@ class NonStockedProduct(Product):
     for example - a Microsoft Windows license.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, price: float | int):
         """
         Initializes a NonStockedProduct.
         """
         super().__init__(name=name, price=price, quantity=0)
-        self._quantity = 0
+        # never runs out of stock, so it is always active
+        self._active = True
 
     @property
-    def quantity(self) -> float:
+    def quantity(self) -> int:
         """
         Getter for quantity (=0 -> see class description)
         """
-        return float(self._quantity)
+        return self._quantity
 
     @quantity.setter
     def quantity(self, quantity: int):
@@ -226,29 +370,27 @@ class NonStockedProduct(Product):
         """
         pass
 
-    def __str__(self) -> str:
+    def _build_show(self) -> str:
         """
-        Returns a string that represents the product.
+        Builds and caches the string that represents the product.
         """
-        return (
-            f"'{self.name}', Price: ${self.price:.2f}, "
+        self._show_cache = (
+            f"'{self._name}', Price: {self._price_str}, "
             f"Quantity: Unlimited, "
-            f"Promotion: {self.promotion}"
+            f"Promotion: {self._promotion}"
         )
+        return self._show_cache
 
     def buy(self, quantity: int) -> float:
         """
         Buys a given quantity of the product.
         """
-        if int(quantity) <= 0:
+        if quantity <= 0:
             raise ValueError(
                 "argument 'quantity' must be >= 1 to buy a product"
             )
 
-        if self.promotion is not None:
-            return self.promotion.apply_promotion(self, quantity)
-        else:
-            return float(quantity) * self.price
+        return self._price_fn(self._price, quantity, self._promo_param)
 
 
 class LimitedProduct(Product):
@@ -259,6 +401,8 @@ class LimitedProduct(Product):
     it should be refused with an 'OrderLimitedError' exception.
     """
 
+    __slots__ = ("_maximum",)
+
     def __init__(
         self, name: str, price: float | int, quantity: int, maximum: int
     ):
@@ -267,9 +411,11 @@ class LimitedProduct(Product):
         """
         super().__init__(name=name, price=price, quantity=quantity)
 
-        if int(maximum) < 1:
+        if type(maximum) is not int:
+            maximum = int(maximum)
+        if maximum < 1:
             raise ValueError("argument 'maximum' must be >= 1.")
-        self._maximum = int(maximum)
+        self._maximum = maximum
 
     @property
     def maximum(self) -> int:
@@ -278,15 +424,16 @@ class LimitedProduct(Product):
         """
         return self._maximum
 
-    def __str__(self) -> str:
+    def _build_show(self) -> str:
         """
-        Returns a string that represents the product.
+        Builds and caches the string that represents the product.
         """
-        return (
-            f"'{self.name}', Price: ${self.price:.2f}, "
-            f"Limited to {self.maximum} per order!, "
-            f"Promotion: {self.promotion}"
+        self._show_cache = (
+            f"'{self._name}', Price: {self._price_str}, "
+            f"Limited to {self._maximum} per order!, "
+            f"Promotion: {self._promotion}"
         )
+        return self._show_cache
 
     def buy(self, quantity: int) -> float:
         """
@@ -294,20 +441,25 @@ class LimitedProduct(Product):
         Buys a given quantity below or equal maximum of the product.
         Returns the total price of the purchase. (float)
         """
-        if int(quantity) <= 0:
+        if quantity <= 0:
             raise ValueError(
                 "argument 'quantity' must be >= 1 to buy a product"
             )
-        if self.maximum < quantity:
-            raise MaximumValueError(self.name, self.maximum)
-        if (self.quantity - int(quantity)) < 0:
-            raise OutOfStockValueError(self.name, quantity)
-        self.quantity -= int(quantity)
-
-        if self.promotion is not None:
-            return self.promotion.apply_promotion(self, quantity)
-        else:
-            return float(quantity) * self.price
+        if self._maximum < quantity:
+            raise MaximumValueError(self._name, self._maximum)
+        stock = self._quantity - quantity
+        if stock < 0:
+            raise OutOfStockValueError(self._name, quantity)
+        self._quantity = stock
+        for store_ref in self._stores:
+            store = store_ref()
+            if store is not None:
+                store._total_quantity -= quantity
+        if stock < 1:
+            self.deactivate()
+        self._show_cache = None
+
+        return self._price_fn(self._price, quantity, self._promo_param)
 
 
 # - eof -
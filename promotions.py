@@ -9,12 +9,74 @@ and SecondHalfPrice, ThirdOneFree + PercentDiscount class interfaces.
 
 from abc import ABC, abstractmethod
 
+# Promotion kinds, used by Product to price a purchase straight from
+# PROMO_TABLE instead of calling Promotion.apply_promotion().
+PROMO_NONE = 0
+PROMO_SECOND_HALF = 1
+PROMO_THIRD_FREE = 2
+PROMO_PERCENT = 3
+PROMO_CUSTOM = -1
+
+
+def _no_promotion(price: float, quantity: int, param: float) -> float:
+    """
+    Returns the full price of 'quantity' items.
+    """
+    return quantity * price
+
+
+def _second_half_price(price: float, quantity: int, param: float) -> float:
+    """
+    Returns the price of 'quantity' items, every second one at half price.
+    """
+    half_qty: int = quantity // 2
+    return ((quantity - half_qty) + half_qty * 0.5) * price
+
+
+def _third_one_free(price: float, quantity: int, param: float) -> float:
+    """
+    Returns the price of 'quantity' items, every third one for free.
+    """
+    return (quantity - quantity // 3) * price
+
+
+def _percent_discount(price: float, quantity: int, param: float) -> float:
+    """
+    Returns the price of 'quantity' items, discounted by the
+    price-factor 'param'. (= 1 - percent / 100)
+    """
+    return quantity * price * param
+
+
+# Pricing function per promotion kind, indexed by PROMO_NONE .. PROMO_PERCENT
+PROMO_TABLE = (
+    _no_promotion,
+    _second_half_price,
+    _third_one_free,
+    _percent_discount,
+)
+
 
 class Promotion(ABC):
     """
     Implements the abstract Promotion class.
+    Subclasses outside of PROMO_TABLE keep the PROMO_CUSTOM kind,
+    and are priced with their apply_promotion() method.
     """
 
+    __slots__ = ("name",)
+
+    kind: int = PROMO_CUSTOM
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Subclasses overriding apply_promotion() without declaring their
+        own kind are priced through apply_promotion(). (PROMO_CUSTOM)
+        """
+        super().__init_subclass__(**kwargs)
+        if "apply_promotion" in cls.__dict__ and "kind" not in cls.__dict__:
+            cls.kind = PROMO_CUSTOM
+
     def __init__(self, name: str):
         """
         Initializes the Promotion.
@@ -26,6 +88,13 @@ class Promotion(ABC):
     def __str__(self) -> str:
         return f"'{self.name}'"
 
+    @property
+    def param(self) -> float:
+        """
+        Getter for the parameter passed to the PROMO_TABLE function.
+        """
+        return 0.0
+
     @abstractmethod
     def apply_promotion(self, product: object, quantity: int) -> float:
         """
@@ -40,19 +109,16 @@ class SecondHalfPrice(Promotion):
     Implements the SecondHalfPrice -class-interface.
     """
 
+    __slots__ = ()
+
+    kind: int = PROMO_SECOND_HALF
+
     def apply_promotion(self, product: object, quantity: int) -> float:
         """
         Apply the 'half-price' discount onto 'quantity' of 'product'.
         Returns the final price as float.
         """
-        total_price: float = 0.0
-        half_price: float = product.price / 2
-        for counter in range(0, quantity):
-            if counter % 2 == 1:
-                total_price += half_price
-            else:
-                total_price += product.price
-        return total_price
+        return _second_half_price(product.price, quantity, self.param)
 
 
 class ThirdOneFree(Promotion):
@@ -60,15 +126,17 @@ class ThirdOneFree(Promotion):
     Implements the ThirdOneFree -class-interface.
     """
 
+    __slots__ = ()
+
+    kind: int = PROMO_THIRD_FREE
+
     def apply_promotion(self, product: object, quantity: int) -> float:
         """
         Apply the 'third-one-free' discount onto 'quantity'
         of 'product'.
         Returns the final price as float.
         """
-        tertiar_qty: int = int(quantity // 3)
-        total_price: float = (quantity - tertiar_qty) * product.price
-        return total_price
+        return _third_one_free(product.price, quantity, self.param)
 
 
 class PercentDiscount(Promotion):
@@ -76,6 +144,10 @@ class PercentDiscount(Promotion):
     Implements the PercentDiscount -class-interface.
     """
 
+    __slots__ = ("_percent", "_factor")
+
+    kind: int = PROMO_PERCENT
+
     def __init__(self, name: str, percent: float | int):
         """
         Initializes a PercentDiscount instance.
@@ -83,15 +155,30 @@ class PercentDiscount(Promotion):
         super().__init__(name=name)
         if float(percent) <= 0.00:
             raise ValueError("argument 'percent' is negative or zero.")
-        self.percent = float(percent)
+        self._percent = float(percent)
+        self._factor = 1.0 - self._percent * 0.01
+
+    @property
+    def percent(self) -> float:
+        """
+        Getter for the discount in percent. (read-only, products cache
+        the price-factor derived from it)
+        """
+        return self._percent
+
+    @property
+    def param(self) -> float:
+        """
+        Getter for the price-factor of the discount.
+        """
+        return self._factor
 
     def apply_promotion(self, product: object, quantity: int) -> float:
         """
         Apply the 'percent' discount onto 'quantity' of 'product'.
         Returns the final price as float.
         """
-        discount_price = product.price - (product.price * (self.percent * 0.01))
-        return discount_price * quantity
+        return _percent_discount(product.price, quantity, self._factor)
 
 
 # - eof -
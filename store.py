@@ -6,26 +6,47 @@
 Implements the Store class.
 """
 
-from typing import Optional, List, Tuple
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Optional, List, Tuple
 from products import Product
 from products import OutOfStockValueError, MaximumValueError
 
 ProductOrder = Tuple[Product, int]
+ActiveProducts = Tuple[Product, ...]
+
+_CENT = Decimal("0.01")
 
 
 class Store:
     """
     A Store that will hold all of these `Product`s instances,
     and will allow the user to make a purchase of multiple products at once.
+    Products are kept in insertion order, keyed by their (unique) name.
     """
 
+    __slots__ = (
+        "_products",
+        "_active_cache",
+        "_total_quantity",
+        "__weakref__",
+    )
+
     def __init__(self, products: Optional[List[Product]]):
-        for product in products:
-            if not isinstance(product, Product):
-                raise ValueError(
-                    "'product' is not an instance of List[Product]"
-                )
-        self._products = products
+        self._products: Dict[str, Product] = {}
+        self._active_cache = None
+        self._total_quantity = 0
+        try:
+            for product in products:
+                if __debug__ and not isinstance(product, Product):
+                    raise ValueError(
+                        "'product' is not an instance of List[Product]"
+                    )
+                self._add_product(product)
+        except ValueError:
+            # don't leave the products attached to a half-built store
+            for product in self._products.values():
+                product._detach(self)
+            raise
 
     def __add__(self, other_store) -> object:
         """
@@ -35,85 +56,103 @@ class Store:
         Raises an exception if there are duplicate products in one
         of the other store instances.
         """
-        new_store: Store = Store(self._products)
-        for other_product in other_store.products:
-            if other_product not in new_store:
-                new_store.add_product(other_product)
-            else:
-                raise ValueError(
-                    f"The product '{other_product}' already exists."
-                )
-        return new_store
+        return Store(self.products + other_store.products)
 
     def __contains__(self, product) -> bool:
         """
         Checks if a product is available in the store. (name-check)
         """
-        for prod in self._products:
-            if prod.name == product.name:
-                return True
+        return product.name in self._products
 
     @property
     def products(self):
         """
         Returns all products in the store, even the inactive ones.
         """
-        return self._products
+        return list(self._products.values())
 
     def add_product(self, product: Product):
         """
         Adds a Product to the store.
+        Raises an exception if a product with the same name exists.
         """
-        if not isinstance(product, Product):
+        if __debug__ and not isinstance(product, Product):
             raise ValueError("'product' is not an instance of Product(..)")
-        self._products.append(product)
+        self._add_product(product)
+
+    def _add_product(self, product: Product):
+        """
+        Adds an already type-checked Product to the store.
+        """
+        if product.name in self._products:
+            raise ValueError(f"The product '{product}' already exists.")
+        self._products[product.name] = product
+        product._attach(self)
+        self._total_quantity += product.quantity
+        self._active_cache = None
 
     def remove_product(self, product: Product):
         """
         Removes a Product from the store.
         """
-        if not isinstance(product, Product):
+        if __debug__ and not isinstance(product, Product):
             raise ValueError("'product' is not an instance of Product(..)")
-        index = 0
-        for _product in self._products:
-            if _product.name == product.name:
-                self._products.pop(index)
-            index += 1
+        removed = self._products.pop(product.name, None)
+        if removed is None:
+            return
+        removed._detach(self)
+        self._total_quantity -= removed.quantity
+        self._active_cache = None
 
     def get_total_quantity(self) -> int:
         """
         Returns how many items are in the store in total.
+        The total is kept up to date by the products themselves.
         """
-        total = 0
-        for product in self._products:
-            total += product.quantity
-        return total
+        return self._total_quantity
 
-    def get_all_products(self) -> List[Product]:
+    def get_all_products(self) -> ActiveProducts:
         """
         Returns all products in the store that are active.
+        The tuple is cached until the store's products change.
         """
-        products: List[Product] = []
-        for product in self._products:
-            if product.is_active():
-                products.append(product)
+        if self._active_cache is None:
+            return self._build_active()
+        return self._active_cache
+
+    def _build_active(self) -> ActiveProducts:
+        """
+        Builds and caches the tuple of active products.
+        """
+        products: ActiveProducts = tuple(
+            [
+                product
+                for product in self._products.values()
+                if product.active
+            ]
+        )
+        self._active_cache = products
         return products
 
     def order(self, shopping_list: List[ProductOrder]) -> float:
         """
         Buys the product(s) with given quantity, and accumulates
         the total price of the order.
+        Each line is rounded half-up to whole cents and summed up
+        as Decimal, so the total carries no floating-point drift.
         Returns the total price as float.
         """
-        total_price: float = 0.00
-        for product_order in shopping_list:
+        total: Decimal = Decimal(0)
+        errors: List[str] = []
+        for product, quantity in shopping_list:
             try:
-                total_price += product_order[0].buy(product_order[-1])
-            except OutOfStockValueError as e:
-                print(f"Error:\n\t{e.message}")
-            except MaximumValueError as e:
-                print(f"Error:\n\t{e.message}")
-        return total_price
+                line_price = Decimal(repr(product.buy(quantity)))
+                total += line_price.quantize(_CENT, rounding=ROUND_HALF_UP)
+            except (OutOfStockValueError, MaximumValueError) as e:
+                errors.append(f"Error:\n\t{e.message}")
+        if errors:
+            print("\n".join(errors))
+        return float(total)
 
 
 # - eof -
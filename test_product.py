@@ -2,9 +2,16 @@
 Unit Tests for the Product-class.
 """
 
+import re
+
 import pytest
 
 from products import Product, OutOfStockValueError
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+_RE_EMPTY_NAME = re.compile(r"argument 'name' is an empty string")
+_RE_NEGATIVE_PRICE = re.compile(r"argument 'price' is negative\.")
+_RE_NEGATIVE_QUANTITY = re.compile(r"argument 'quantity' is negative\.")
 
 
 def test_creating_prod():
@@ -13,17 +20,24 @@ def test_creating_prod():
     )
 
 
-def test_creating_prod_invalid_details():
-    with pytest.raises(ValueError, match="argument 'name' is an empty string"):
+@pytest.mark.parametrize(
+    "name,price,quantity,match",
+    [
         # Empty name
-        Product("", price=1450, quantity=100)
-    with pytest.raises(ValueError, match="argument 'price' is negative."):
+        ("", 1450, 100, _RE_EMPTY_NAME),
         # Negative Price
-        Product("MacBook Air M2", price=-10, quantity=100)
-    with pytest.raises(ValueError, match="argument 'quantity' is negative."):
+        ("MacBook Air M2", -10, 100, _RE_NEGATIVE_PRICE),
         # Negative Quantity
-        Product("MacBook Air M2", price=10.0, quantity=-100)
-    with pytest.raises(ValueError, match="argument 'quantity' is negative."):
+        ("MacBook Air M2", 10.0, -100, _RE_NEGATIVE_QUANTITY),
+    ],
+)
+def test_creating_prod_invalid_details(name, price, quantity, match):
+    with pytest.raises(ValueError, match=match):
+        Product(name, price=price, quantity=quantity)
+
+
+def test_setting_invalid_quantity():
+    with pytest.raises(ValueError, match=_RE_NEGATIVE_QUANTITY):
         # Negative quantity setter value
         Product("MacBook Air M2", price=10.0, quantity=100).quantity = -1
 
@@ -60,8 +74,40 @@ def test_buy_too_much():
         product.buy(7)
 
 
-test_creating_prod()
-test_creating_prod_invalid_details()
-test_prod_becomes_inactive()
-test_buy_modifies_quantity()
-test_buy_too_much()
+def test_show_reflects_changes():
+    product = Product(name="AMD Ryzen 57000X", price=150.00, quantity=5)
+    # cached string is returned as long as nothing changes
+    assert product.show() is product.show()
+    # buying changes the quantity shown
+    product.buy(2)
+    assert "Quantity: 3" in product.show()
+    # setting a promotion changes the promotion shown
+    product.set_promotion(ThirdOneFree("Third One Free!"))
+    assert product.show().endswith("Promotion: 'Third One Free!'")
+
+
+def test_buy_with_promotion():
+    product = Product(name="AMD Ryzen 57000X", price=150.00, quantity=10)
+    product.set_promotion(SecondHalfPrice("Second Half price!"))
+    # every second item is half price: 150 + 75 + 150
+    assert product.buy(3) == 375.00
+    product.set_promotion(ThirdOneFree("Third One Free!"))
+    # every third item is free: 150 + 150 + 0
+    assert product.buy(3) == 300.00
+    thirty_percent = PercentDiscount("30% Off!", percent=30)
+    product.set_promotion(thirty_percent)
+    assert product.buy(2) == pytest.approx(210.00)
+    # the percent cannot change behind the cached pricing
+    with pytest.raises(AttributeError):
+        thirty_percent.percent = 50
+
+
+def test_buy_with_overridden_promotion():
+    class FlatPrice(SecondHalfPrice):
+        def apply_promotion(self, product, quantity) -> float:
+            return 1.0
+
+    product = Product(name="AMD Ryzen 57000X", price=150.00, quantity=10)
+    product.set_promotion(FlatPrice("Flat price!"))
+    # the overridden apply_promotion() is used, not the inherited pricing
+    assert product.buy(2) == 1.0
@@ -0,0 +1,145 @@
+"""
+Unit Tests for the Store-class.
+"""
+
+import gc
+import weakref
+
+import pytest
+
+from products import Product, NonStockedProduct
+from store import Store
+
+
+def make_products():
+    return [
+        Product(name="AMD Ryzen 57000X", price=150.00, quantity=5),
+        Product(name="Intel Core i7", price=300.00, quantity=2),
+        NonStockedProduct(name="Windows License", price=125),
+    ]
+
+
+def test_total_quantity_follows_changes():
+    products = make_products()
+    store = Store(products)
+    # non-stocked products do not add to the total
+    assert store.get_total_quantity() == 7
+    # buying decrements the total
+    products[0].buy(2)
+    assert store.get_total_quantity() == 5
+    # setting a quantity adjusts the total by the difference
+    products[1].quantity = 10
+    assert store.get_total_quantity() == 13
+    # adding and removing products adjusts the total
+    store.add_product(Product(name="Google Pixel 7", price=500, quantity=4))
+    assert store.get_total_quantity() == 17
+    store.remove_product(products[1])
+    assert store.get_total_quantity() == 7
+
+
+def test_total_quantity_shared_by_merged_stores():
+    products = make_products()
+    store_a = Store(products[:2])
+    store_b = Store(products[2:])
+    merged = store_a + store_b
+    assert merged.get_total_quantity() == 7
+    # a purchase updates every store holding the product
+    products[0].buy(5)
+    assert store_a.get_total_quantity() == 2
+    assert merged.get_total_quantity() == 2
+    assert store_b.get_total_quantity() == 0
+
+
+def test_discarded_store_is_released():
+    product = Product(name="AMD Ryzen 57000X", price=150.00, quantity=5)
+    store_a = Store([product])
+    store_b = Store([Product(name="Intel Core i7", price=300.00, quantity=2)])
+    # merge the stores and throw the merged store away again
+    for _ in range(10):
+        merged = store_a + store_b
+    released = weakref.ref(merged)
+    del merged
+    gc.collect()
+    # the product does not keep the discarded store alive
+    assert released() is None
+    # and still updates the store in use
+    product.buy(2)
+    assert store_a.get_total_quantity() == 3
+    assert product.quantity == 3
+
+
+def test_contains():
+    products = make_products()
+    store = Store(products[:2])
+    assert products[0] in store
+    # a product that is not in store is reported as False, not None
+    assert (products[2] in store) is False
+
+
+def test_duplicate_products_rejected():
+    products = make_products()
+    duplicate = Product(name="AMD Ryzen 57000X", price=99.00, quantity=1)
+    store = Store(products)
+    with pytest.raises(ValueError, match="already exists"):
+        store.add_product(duplicate)
+    with pytest.raises(ValueError, match="already exists"):
+        store + Store([duplicate])
+    with pytest.raises(ValueError, match="already exists"):
+        Store([duplicate, duplicate])
+    # the store keeps its own product and total
+    assert store.products[0] is products[0]
+    assert store.get_total_quantity() == 7
+
+
+def test_remove_product_keeps_others():
+    products = make_products()
+    store = Store(products)
+    store.remove_product(products[0])
+    # the product after the removed one is not skipped
+    assert [p.name for p in store.products] == [
+        "Intel Core i7",
+        "Windows License",
+    ]
+    assert products[0] not in store
+    # removing an absent product is a no-op
+    store.remove_product(products[0])
+    assert len(store.products) == 2
+
+
+def test_failed_construction_leaves_products_usable():
+    product = Product(name="AMD Ryzen 57000X", price=150.00, quantity=5)
+    with pytest.raises(ValueError, match="already exists"):
+        Store([product, product])
+    with pytest.raises(ValueError, match="not an instance"):
+        Store([product, "not a product"])
+    # the product still works, and only updates the store built later
+    store = Store([product])
+    assert product.buy(2) == 300.00
+    assert store.get_total_quantity() == 3
+    assert store.get_all_products() == (product,)
+
+
+def test_get_all_products():
+    product = Product(name="AMD Ryzen 57000X", price=150.00, quantity=1)
+    store = Store([product])
+    assert store.get_all_products() == (product,)
+    # sold-out products are no longer listed
+    store.order([(product, 1)])
+    active = store.get_all_products()
+    assert active == ()
+    # an empty result is cached as well
+    assert store.get_all_products() is active
+
+
+def test_order_total_in_cents():
+    store = Store(
+        [
+            Product(name="Sticker", price=0.10, quantity=10),
+            Product(name="Pin", price=0.20, quantity=10),
+            Product(name="Button", price=0.125, quantity=10),
+        ]
+    )
+    sticker, pin, button = store.products
+    assert store.order([(sticker, 1), (pin, 1)]) == 0.3
+    # lines are rounded half-up to whole cents
+    assert store.order([(button, 1)]) == 0.13